@@ -7,22 +7,45 @@ from typing import Optional
 import pandas as pd
 import streamlit as st
 
-from df2notoin import upload_dataframe_to_notion_data_source 
+from df2notoin import NotionAPIError, NotionUploadError, get_data_source_schema, upload_dataframe_to_notion_data_source
 from preprocess import preprocess_reservation, preprocess_customer
 
+EXCEL_DTYPES = {"생년월일": object, "핸드폰": object}
+
+@st.cache_data(show_spinner=False)
+def parse_excel(file_bytes: bytes) -> pd.DataFrame:
+    """Parse Excel file contents into a DataFrame, cached on the uploaded bytes."""
+    buffer = io.BytesIO(file_bytes)
+    try:
+        # calamine (Rust) handles both .xls and .xlsx and is much faster than openpyxl
+        return pd.read_excel(buffer, engine="calamine", dtype=EXCEL_DTYPES)
+    except ImportError:
+        # python-calamine not installed: fall back to openpyxl / xlrd
+        return pd.read_excel(buffer, dtype=EXCEL_DTYPES)
+
 def read_excel(file) -> Optional[pd.DataFrame]:
     """Read the uploaded Excel file into a DataFrame with basic error handling."""
     try:
-        return pd.read_excel(file, dtype={"생년월일": object, "핸드폰": object})
+        return parse_excel(file.getvalue())
     except Exception as exc:  # pragma: no cover - user facing
         st.error(f"엑셀 파일을 읽는 중 오류가 발생했습니다: {exc}")
         return None
 
+@st.cache_data(show_spinner=False)
+def preprocess_upload(file_bytes: bytes, today: str) -> pd.DataFrame:
+    """Parse and run the reservation → customer preprocessing, cached on the uploaded bytes and date."""
+    return preprocess_customer(preprocess_reservation(parse_excel(file_bytes), today = today))
+
 def convert_to_csv(df: pd.DataFrame) -> bytes:
     """Convert DataFrame to CSV bytes without the index column."""
-    csv_buffer = io.StringIO()
-    df.to_csv(csv_buffer, index=False)
-    return csv_buffer.getvalue().encode("utf-8")
+    csv_buffer = io.BytesIO()
+    df.to_csv(csv_buffer, index=False, encoding="utf-8")
+    return csv_buffer.getvalue()
+
+@st.cache_data(ttl=300, show_spinner=False)
+def cached_data_source_schema(token: str, data_source_id: str) -> dict:
+    """Fetch the Notion data source schema, cached per (token, data source) for 5 minutes."""
+    return get_data_source_schema(data_source_id, token)
 
 NOTION_TOKEN = st.secrets["NOTION_TOKEN"]
 DATA_SOURCE_ID = st.secrets["DATA_SOURCE_ID"]
@@ -48,7 +71,7 @@ def st_excel_to_notion(key = None, data_source_id = None,  notion_key = None):
     st.dataframe(df.head())
 
     st.subheader("전처리된 데이터")
-    processed_df = preprocess_customer(preprocess_reservation(df.copy(), today = selected_date))
+    processed_df = preprocess_upload(uploaded_file.getvalue(), selected_date)
     st.dataframe(processed_df.head())
 
     csv_bytes = convert_to_csv(processed_df)
@@ -66,11 +89,27 @@ def st_excel_to_notion(key = None, data_source_id = None,  notion_key = None):
     if st.button("Notion에 업로드", key=f"btn_upload_{key}", type="primary"):
 
         st.info(f"전체 {len(processed_df)}개의 데이터가 Notion에 업로드 중 입니다.")
-        page_ids = upload_dataframe_to_notion_data_source(
-            processed_df,
-            data_source_id = str(data_source_id),
-            token = notion_key
-        )
+        try:
+            properties_schema = cached_data_source_schema(notion_key, str(data_source_id))
+            unmatched_columns = [col for col in processed_df.columns if col not in properties_schema]
+            if unmatched_columns:
+                st.warning(f"Notion 데이터베이스에 없는 컬럼은 업로드되지 않습니다: {', '.join(map(str, unmatched_columns))}")
+
+            progress_bar = st.progress(0.0)
+            page_ids = upload_dataframe_to_notion_data_source(
+                processed_df,
+                data_source_id = str(data_source_id),
+                token = notion_key,
+                properties_schema = properties_schema,
+                progress_callback = lambda done, total: progress_bar.progress(done / total, text=f"{done}/{total}")
+            )
+        except NotionUploadError as exc:
+            st.error(f"{len(exc.failures)}개의 데이터 업로드에 실패했습니다. ({len(exc.page_ids)}개 업로드 완료)")
+            st.dataframe(pd.DataFrame(exc.failures, columns=["row", "error"]))
+            return
+        except NotionAPIError as exc:
+            st.error(f"Notion 업로드 중 오류가 발생했습니다: {exc}")
+            return
         messege = f"전체 {len(processed_df)}개의 데이터가 Notion에 {len(page_ids)}개의 페이지로 업로드되었습니다."
         st.success(messege)
 
@@ -1,17 +1,68 @@
+import asyncio
 import requests
+import aiohttp
 import pandas as pd
+from aiolimiter import AsyncLimiter
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime, date
-from typing import Dict, Any, Optional
+from typing import Callable, Dict, Any, Optional
 
 NOTION_VERSION = "2025-09-03"
 BASE_URL = "https://api.notion.com/v1"
 
+# 동시 업로드 / 재시도 설정 (Notion API 평균 3 req/s 제한 기준)
+MAX_CONCURRENCY = 16
+RATE_LIMIT_PER_SEC = 3
+MAX_RETRIES = 5
+BACKOFF_BASE = 1.0
+BACKOFF_CAP = 30.0
+REQUEST_TIMEOUT = 30
+# 요청이 적용되지 않았음이 확실한 응답만 재시도 (429 rate limit, 503 일시적 서비스 불가)
+RETRYABLE_STATUSES = (429, 503)
+RETRY_PASS_DELAY = 2.0
+MAX_CHUNKS_IN_FLIGHT = 2
+
+# 동기 요청용 세션 (keep-alive 로 TLS 연결 재사용, 429/5xx 는 urllib3 가 Retry-After 를 따라 재시도)
+_session = requests.Session()
+_session.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=32,
+        pool_maxsize=32,
+        max_retries=Retry(
+            total=MAX_RETRIES,
+            backoff_factor=0.5,
+            status_forcelist=[429, 500, 502, 503, 504],
+            raise_on_status=False,
+        ),
+    ),
+)
+
 
 class NotionAPIError(Exception):
     """간단한 Notion API 에러 래퍼"""
     pass
 
 
+class NotionUploadError(NotionAPIError):
+    """일부 row 의 페이지 생성 실패 (성공한 page id 와 실패한 row 목록을 함께 전달)"""
+
+    def __init__(self, page_ids: list[str], failures: list[tuple[Any, str]]):
+        self.page_ids = page_ids
+        self.failures = failures
+        details = "; ".join(f"row {idx}: {message}" for idx, message in failures[:5])
+        super().__init__(f"Failed to create {len(failures)} page(s): {details}")
+
+
+class _TransientError(NotionAPIError):
+    """재시도 횟수를 다 써버린 429 / 503 응답 (나중에 한 번 더 시도해볼 만한 실패)"""
+
+    def __init__(self, message: str, status: int):
+        self.status = status
+        super().__init__(message)
+
+
 def _make_headers(token: str) -> Dict[str, str]:
     return {
         "Authorization": f"Bearer {token}",
@@ -29,7 +80,7 @@ def get_data_source_schema(
     (각 프로퍼티의 name, type 등을 사용해서 DataFrame → Notion 변환에 활용)
     """
     url = f"{BASE_URL}/data_sources/{data_source_id}"
-    res = requests.get(url, headers=_make_headers(token))
+    res = _session.get(url, headers=_make_headers(token), timeout=REQUEST_TIMEOUT)
     if not res.ok:
         raise NotionAPIError(
             f"Failed to retrieve data source schema: "
@@ -155,11 +206,295 @@ def value_to_notion_property(
     return None
 
 
+def _null_mask(series: pd.Series) -> list[bool]:
+    """_is_null 의 컬럼 단위 버전 (NaN / None / NaT / 빈 문자열)"""
+    mask = series.isna()
+    if series.dtype == object or pd.api.types.is_string_dtype(series.dtype):
+        try:
+            mask = mask | series.str.strip().eq("").fillna(False).astype(bool)
+        except AttributeError:
+            # 문자열이 하나도 없는 object 컬럼
+            pass
+    return mask.tolist()
+
+
+def _to_texts(series: pd.Series) -> list[str]:
+    """
+    각 값의 str(value) 리스트
+    object / 문자열 컬럼은 astype(str) 이 str() 과 같지만, datetime 등 다른 dtype 은
+    포맷이 달라질 수 있어서 (예: 자정만 있는 datetime64 → '2024-01-01') 값마다 str() 을 쓴다.
+    """
+    if series.dtype == object or pd.api.types.is_string_dtype(series.dtype):
+        return series.astype(str).tolist()
+    return [str(value) for value in series.tolist()]
+
+
+def column_to_notion_properties(
+    series: pd.Series,
+    prop_schema: Dict[str, Any],
+) -> list[Optional[Dict[str, Any]]]:
+    """
+    컬럼 전체 + 해당 프로퍼티 스키마 → row 별 Notion property payload 리스트
+    타입 분기와 값 변환을 컬럼당 한 번만 하고, 자주 쓰는 타입은 pandas 벡터 연산으로 처리한다.
+    (그 외 타입이나 벡터화하기 애매한 값은 value_to_notion_property 로 한 칸씩 변환)
+    """
+    ptype = prop_schema.get("type")
+    nulls = _null_mask(series)
+
+    if ptype in ("title", "rich_text"):
+        texts = _to_texts(series)
+        return [
+            None if is_null else {ptype: [{"type": "text", "text": {"content": text}}]}
+            for text, is_null in zip(texts, nulls)
+        ]
+
+    if ptype == "select":
+        texts = _to_texts(series)
+        return [
+            None if is_null else {"select": {"name": text}}
+            for text, is_null in zip(texts, nulls)
+        ]
+
+    if ptype == "number" and not (
+        pd.api.types.is_datetime64_any_dtype(series.dtype)
+        or pd.api.types.is_timedelta64_dtype(series.dtype)
+    ):
+        numbers = pd.to_numeric(series, errors="coerce").astype(float)
+        return [
+            None if is_null or num != num else {"number": num}
+            for num, is_null in zip(numbers.tolist(), nulls)
+        ]
+
+    if ptype == "multi_select" and not (
+        series.dtype == object
+        and series.map(lambda v: isinstance(v, (list, tuple, set))).any()
+    ):
+        payloads: list[Optional[Dict[str, Any]]] = []
+        for text, is_null in zip(_to_texts(series), nulls):
+            names = [] if is_null else [n.strip() for n in text.split(",") if n.strip()]
+            payloads.append({"multi_select": [{"name": n} for n in names]} if names else None)
+        return payloads
+
+    if (
+        ptype == "date"
+        and pd.api.types.is_datetime64_dtype(series.dtype)
+        and not (series.dt.microsecond.fillna(0) != 0).any()
+    ):
+        starts = series.dt.strftime("%Y-%m-%dT%H:%M:%S").tolist()
+        return [
+            None if is_null else {"date": {"start": start}}
+            for start, is_null in zip(starts, nulls)
+        ]
+
+    return [
+        None if is_null else value_to_notion_property(value, prop_schema)
+        for value, is_null in zip(series.tolist(), nulls)
+    ]
+
+
+def _backoff_delay(attempt: int, retry_after: Optional[str] = None) -> float:
+    """Retry-After 헤더가 있으면 그 값을, 없으면 지수 백오프(1s, 2s, 4s ... 최대 30s)를 사용"""
+    if retry_after:
+        try:
+            return min(BACKOFF_CAP, float(retry_after))
+        except ValueError:
+            pass
+    return min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt)
+
+
+async def _post_page(
+    session: aiohttp.ClientSession,
+    sem: asyncio.Semaphore,
+    limiter: AsyncLimiter,
+    endpoint: str,
+    headers: Dict[str, str],
+    payload: Dict[str, Any],
+) -> str:
+    """
+    페이지 하나를 생성하고 page id 를 리턴한다.
+    429 / 503 은 백오프 후 재시도하고, 그 외 4xx / 5xx 는 바로 에러를 낸다.
+    타임아웃이나 연결 끊김은 Notion 쪽에서 이미 페이지가 만들어졌을 수 있어서
+    (재시도하면 중복 row 가 생길 수 있음) 재시도하지 않고 실패로 처리한다.
+    """
+    last_error = ""
+    last_status = 0
+    for attempt in range(MAX_RETRIES):
+        retry_after = None
+        try:
+            async with sem, limiter:
+                async with session.post(endpoint, headers=headers, json=payload) as res:
+                    if res.status in RETRYABLE_STATUSES:
+                        retry_after = res.headers.get("Retry-After")
+                        last_status = res.status
+                        last_error = f"{res.status} {await res.text()}"
+                    elif res.status >= 400:
+                        raise NotionAPIError(f"{res.status} {await res.text()}")
+                    else:
+                        return (await res.json())["id"]
+        except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+            raise NotionAPIError(
+                f"Request failed, the page may or may not have been created: {exc!r}"
+            ) from exc
+
+        # 마지막 시도 후에는 기다릴 필요 없이 바로 실패 처리
+        if attempt == MAX_RETRIES - 1:
+            break
+        # 세마포어를 놓은 상태에서 대기해야 다른 요청이 계속 진행된다
+        await asyncio.sleep(_backoff_delay(attempt, retry_after))
+
+    raise _TransientError(f"Retry limit exceeded ({MAX_RETRIES}): {last_error}", last_status)
+
+
+def _build_page_bodies(
+    df: pd.DataFrame,
+    data_source_id: str,
+    targets: list[tuple[int, str, Dict[str, Any]]],
+) -> tuple[list[Any], list[Dict[str, Any]]]:
+    """
+    df 의 각 row → 페이지 생성 body 로 변환 (전송할 프로퍼티가 없는 row 는 제외)
+    targets 는 (컬럼 위치, Notion property 이름, 프로퍼티 스키마) 리스트
+    """
+    # 값 변환은 컬럼 단위로 미리 해두고, row 루프에서는 dict 조립만 한다
+    prop_names = [notion_prop_name for _, notion_prop_name, _ in targets]
+    converted = [
+        column_to_notion_properties(df.iloc[:, pos], prop_schema)
+        for pos, _, prop_schema in targets
+    ]
+
+    row_indices: list[Any] = []
+    bodies: list[Dict[str, Any]] = []
+    for idx, *cells in zip(df.index, *converted):
+        properties_payload: Dict[str, Any] = {
+            notion_prop_name: prop_payload
+            for notion_prop_name, prop_payload in zip(prop_names, cells)
+            if prop_payload is not None
+        }
+
+        if not properties_payload:
+            # 전송할 프로퍼티가 없으면 row 스킵
+            continue
+
+        row_indices.append(idx)
+        bodies.append({
+            "parent": {
+                "type": "data_source_id",
+                "data_source_id": data_source_id,
+            },
+            "properties": properties_payload,
+        })
+
+    return row_indices, bodies
+
+
+async def _upload_in_chunks(
+    df: pd.DataFrame,
+    data_source_id: str,
+    targets: list[tuple[int, str, Dict[str, Any]]],
+    headers: Dict[str, str],
+    chunk_size: int,
+    progress_callback: Optional[Callable[[int, int], None]],
+) -> tuple[list[Any], list[Any]]:
+    """
+    chunk_size 행씩 body 를 만들어 큐에 넣고(producer), 꺼내는 대로 바로 업로드한다(consumer).
+    업로드 중인 chunk 는 MAX_CHUNKS_IN_FLIGHT 개로 제한하고 큐도 1칸이라,
+    다음 chunk 변환은 앞 chunk 업로드를 기다리는 동안 조금씩 진행된다.
+    리턴값은 (row index 리스트, 같은 순서의 page id 또는 예외 리스트)
+    """
+    total_rows = len(df)
+    queue: asyncio.Queue = asyncio.Queue(maxsize=1)
+    done_rows = 0
+
+    async def produce() -> None:
+        try:
+            for start in range(0, total_rows, chunk_size):
+                chunk = df.iloc[start:start + chunk_size]
+                await queue.put((len(chunk), *_build_page_bodies(chunk, data_source_id, targets)))
+                # 이미 큐에 들어간 요청들이 진행될 수 있도록 이벤트 루프에 양보
+                await asyncio.sleep(0)
+        except Exception:
+            # 변환 중 에러가 나도 consumer 가 멈추지 않도록 종료 신호를 보내고 에러는 다시 올린다
+            # (취소된 경우에는 consumer 도 같이 정리되므로 신호를 보내지 않는다)
+            await queue.put(None)
+            raise
+        await queue.put(None)
+
+    def on_chunk_done(n_rows: int) -> None:
+        nonlocal done_rows
+        done_rows += n_rows
+        if progress_callback is not None:
+            progress_callback(done_rows, total_rows)
+
+    sem = asyncio.Semaphore(MAX_CONCURRENCY)
+    limiter = AsyncLimiter(RATE_LIMIT_PER_SEC, 1)
+    connector = aiohttp.TCPConnector(limit_per_host=MAX_CONCURRENCY)
+    timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        producer = asyncio.create_task(produce())
+        chunks: list[tuple[list[Any], list[Dict[str, Any]], asyncio.Future]] = []
+        in_flight: set[asyncio.Future] = set()
+        try:
+            while (item := await queue.get()) is not None:
+                n_rows, row_indices, bodies = item
+                future = asyncio.gather(
+                    *[
+                        _post_page(session, sem, limiter, f"{BASE_URL}/pages", headers, body)
+                        for body in bodies
+                    ],
+                    return_exceptions=True,
+                )
+                future.add_done_callback(lambda _, n=n_rows: on_chunk_done(n))
+                chunks.append((row_indices, bodies, future))
+
+                in_flight.add(future)
+                future.add_done_callback(in_flight.discard)
+                if len(in_flight) >= MAX_CHUNKS_IN_FLIGHT:
+                    await asyncio.wait(set(in_flight), return_when=asyncio.FIRST_COMPLETED)
+            # producer 에서 난 에러는 여기서 다시 올라온다
+            await producer
+        except BaseException:
+            producer.cancel()
+            for _, _, future in chunks:
+                future.cancel()
+            await asyncio.gather(producer, *[future for _, _, future in chunks], return_exceptions=True)
+            raise
+
+        all_indices: list[Any] = []
+        all_bodies: list[Dict[str, Any]] = []
+        all_results: list[Any] = []
+        for row_indices, bodies, future in chunks:
+            all_indices.extend(row_indices)
+            all_bodies.extend(bodies)
+            all_results.extend(await future)
+
+        # 마지막 실패가 429 / 503 응답이었던 row 만 잠시 쉬었다가 한 번 더 업로드
+        # (타임아웃 / 연결 끊김은 페이지가 이미 만들어졌을 수 있으므로 다시 보내지 않음)
+        retry_positions = [
+            pos for pos, result in enumerate(all_results)
+            if isinstance(result, _TransientError) and result.status in RETRYABLE_STATUSES
+        ]
+        if retry_positions:
+            await asyncio.sleep(RETRY_PASS_DELAY)
+            retried = await asyncio.gather(
+                *[
+                    _post_page(session, sem, limiter, f"{BASE_URL}/pages", headers, all_bodies[pos])
+                    for pos in retry_positions
+                ],
+                return_exceptions=True,
+            )
+            for pos, result in zip(retry_positions, retried):
+                all_results[pos] = result
+
+    return all_indices, all_results
+
+
 def upload_dataframe_to_notion_data_source(
     df: pd.DataFrame,
     data_source_id: str,
     token: str,
     column_mapping: Optional[Dict[str, str]] = None,
+    properties_schema: Optional[Dict[str, Any]] = None,
+    chunk_size: int = 200,
+    progress_callback: Optional[Callable[[int, int], None]] = None,
 ) -> list[str]:
     """
     pandas DataFrame 을 Notion data source 로 전송하는 함수.
@@ -175,66 +510,65 @@ def upload_dataframe_to_notion_data_source(
     column_mapping : dict, optional
         {DataFrame 컬럼명: Notion property 이름} 매핑.
         지정하지 않으면 컬럼명과 프로퍼티 이름이 동일하다고 가정.
+    properties_schema : dict, optional
+        미리 가져온 data source 스키마 (get_data_source_schema 결과).
+        지정하지 않으면 호출할 때마다 API 로 새로 가져온다.
+    chunk_size : int
+        한 번에 변환해서 업로드 큐에 넣을 row 수.
+    progress_callback : callable, optional
+        chunk 하나의 업로드가 끝날 때마다 (완료된 row 수, 전체 row 수) 로 호출된다.
 
     Returns
     -------
     list[str]
         생성된 Notion page id 리스트
+
+    Raises
+    ------
+    NotionAPIError
+        DataFrame 컬럼 중 스키마와 일치하는 것이 하나도 없을 때 (API 호출 전에 확인).
+    NotionUploadError
+        재시도 후에도 생성에 실패한 row 가 있을 때.
+        성공한 page id 는 ``page_ids``, 실패한 (row index, 에러 메시지) 는 ``failures`` 에 담긴다.
     """
     if column_mapping is None:
         column_mapping = {col: col for col in df.columns}
 
-    # 1) data source 스키마 가져오기
-    properties_schema = get_data_source_schema(data_source_id, token)
+    # 1) data source 스키마 가져오기 (캐시된 스키마가 있으면 재사용)
+    if properties_schema is None:
+        properties_schema = get_data_source_schema(data_source_id, token)
 
-    created_page_ids: list[str] = []
     headers = _make_headers(token)
 
-    for idx, row in df.iterrows():
-        properties_payload: Dict[str, Any] = {}
-
-        for df_col, notion_prop_name in column_mapping.items():
-            if notion_prop_name not in properties_schema:
-                # 스키마에 없는 컬럼은 무시
-                continue
-
-            prop_schema = properties_schema[notion_prop_name]
-            value = row.get(df_col)
-
-            prop_payload = value_to_notion_property(value, prop_schema)
-            if prop_payload is not None:
-                properties_payload[notion_prop_name] = prop_payload
-
-        if not properties_payload:
-            # 전송할 프로퍼티가 없으면 row 스킵
-            continue
-
-        body = {
-            "parent": {
-                "type": "data_source_id",
-                "data_source_id": data_source_id,
-            },
-            "properties": properties_payload,
-        }
-
-        res = requests.post(
-            f"{BASE_URL}/pages",
-            headers=headers,
-            json=body,
+    # 컬럼 위치와 프로퍼티 스키마는 모든 row 에서 같으므로 루프 밖에서 한 번만 계산
+    # (스키마나 DataFrame 에 없는 컬럼은 무시)
+    col_positions = {col: pos for pos, col in enumerate(df.columns)}
+    targets = [
+        (col_positions[df_col], notion_prop_name, properties_schema[notion_prop_name])
+        for df_col, notion_prop_name in column_mapping.items()
+        if notion_prop_name in properties_schema and df_col in col_positions
+    ]
+    if not targets:
+        # 매칭되는 컬럼이 하나도 없으면 페이지를 만들기 전에 바로 알림
+        raise NotionAPIError(
+            "No DataFrame columns match the Notion data source schema: "
+            f"{list(column_mapping)}"
         )
 
-        if res.status_code == 429:
-            raise NotionAPIError(
-                "Rate limited by Notion API (HTTP 429). "
-                "잠시 후 다시 시도하거나, 백오프 로직을 추가하세요."
-            )
+    # 2) chunk 단위로 body 를 만들면서 동시에 업로드 (rate limit / 백오프는 _post_page 에서 처리)
+    row_indices, results = asyncio.run(
+        _upload_in_chunks(df, data_source_id, targets, headers, chunk_size, progress_callback)
+    )
 
-        if not res.ok:
-            raise NotionAPIError(
-                f"Failed to create page for row {idx}: "
-                f"{res.status_code} {res.text}"
-            )
+    created_page_ids: list[str] = []
+    failures: list[tuple[Any, str]] = []
+    for idx, result in zip(row_indices, results):
+        if isinstance(result, BaseException):
+            failures.append((idx, str(result)))
+        else:
+            created_page_ids.append(result)
 
-        created_page_ids.append(res.json()["id"])
+    if failures:
+        raise NotionUploadError(created_page_ids, failures)
 
     return created_page_ids
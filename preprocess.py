@@ -1,24 +1,29 @@
+import numpy as np
 import pandas as pd
 
-def preprocess_reservation(df: pd.DataFrame, today = None) -> pd.DataFrame:
-    
-    state_code = {
-        1: "예약",
-        3: "부도",
-        4: "취소",
-        5: "완료",
-        7: "변경",
-        9: "당일",
-        10: "결정",
-        13: "재상담",
-        16: "동행",
-        17: "비대면",
-        21: "모델",
-        24: "부재",
-        25: "페이스온",
-        26: "보류"
-    }
+STATE_CODE = {
+    1: "예약",
+    3: "부도",
+    4: "취소",
+    5: "완료",
+    7: "변경",
+    9: "당일",
+    10: "결정",
+    13: "재상담",
+    16: "동행",
+    17: "비대면",
+    21: "모델",
+    24: "부재",
+    25: "페이스온",
+    26: "보류"
+}
 
+# 상태 코드 → 상태명 룩업 테이블 (코드 값을 인덱스로 바로 조회, 없는 코드는 None)
+_STATE_LUT = np.full(max(STATE_CODE) + 1, None, dtype=object)
+for _code, _name in STATE_CODE.items():
+    _STATE_LUT[_code] = _name
+
+def preprocess_reservation(df: pd.DataFrame, today = None) -> pd.DataFrame:
     if today is None:
         today = pd.Timestamp.today().strftime("%Y-%m-%d")
 
@@ -26,28 +31,43 @@ def preprocess_reservation(df: pd.DataFrame, today = None) -> pd.DataFrame:
     df["reservation_id"] = df["지점"].notna().cumsum()
     df["시간"] = df["시간"].ffill()
 
-    df["예약일시"] = pd.to_datetime(
-        today + " " +
-        df["시간"]
-        .str.replace("오전", "AM")
-        .str.replace("오후", "PM"),
-        format="%Y-%m-%d %p %I:%M"
+    # "오전 09:30" → (오전, 09, 30) 으로 나눠 정수 연산으로 예약일시 계산 (strptime %p 파싱 생략)
+    times = df["시간"].astype("string")
+    # 시는 1~12, 분은 0~59 만 허용 (strptime "%p %I:%M" 과 같은 범위)
+    ampm_hm = times.str.extract(r"^\s*(오전|오후)\s+(0?[1-9]|1[0-2]):([0-5]?\d)\s*$")
+    malformed = times.notna() & ampm_hm[0].isna()
+    if malformed.any():
+        raise ValueError(
+            "시간 값은 '오전/오후 HH:MM' 형식이어야 합니다: "
+            f"{times[malformed].unique()[:5].tolist()}"
+        )
+    is_pm = ampm_hm[0].eq("오후").fillna(False).to_numpy(dtype=bool)
+    hour = ampm_hm[1].astype(float) % 12 + np.where(is_pm, 12, 0)
+    minute = ampm_hm[2].astype(float)
+    df["예약일시"] = (
+        pd.Timestamp(today)
+        + pd.to_timedelta(hour, unit="h")
+        + pd.to_timedelta(minute, unit="m")
     )
 
-    df = df.drop_duplicates(subset=["reservation_id"], keep="first").loc[:,["차트번호", "고객명", "reservation_id", "구분", "상태", "예약일시", "등록일시", "생년월일", "핸드폰", "원장", "상담자", "메모"]]
-    df = df[df["차트번호"].notna()].copy()
+    # 예약별 첫 행 중 차트번호가 있는 행 + 필요한 컬럼을 한 번에 선택 (중간 복사본 없이 한 번만 복사)
+    keep = ~df["reservation_id"].duplicated(keep="first") & df["차트번호"].notna()
+    df = df.loc[keep, ["차트번호", "고객명", "reservation_id", "구분", "상태", "예약일시", "등록일시", "생년월일", "핸드폰", "원장", "상담자", "메모"]]
     df["차트번호"] = df["차트번호"].astype(int)
-    df["상태"] = df["상태"].astype(int)
-    df["상태"] = df["상태"].map(state_code)
+    # 상태가 비어 있으면 -1 (룩업 범위 밖) 로 두어 None 이 되도록 함
+    codes = pd.to_numeric(df["상태"]).fillna(-1).astype(np.int64).to_numpy()
+    known = (codes >= 0) & (codes < len(_STATE_LUT))
+    df["상태"] = np.where(known, _STATE_LUT[np.where(known, codes, 0)], None)
 
     return df
 
 def preprocess_event(df: pd.DataFrame) -> pd.DataFrame:
     events = ["내원", "진행", "완료", "퇴원"]
-    df = (
-        df.merge(pd.DataFrame({"event_name": events}), how="cross")
-        .assign(event_id=lambda x: x.groupby("reservation_id").cumcount() + 1)
-        )
+    # 예약 한 건당 이벤트 수만큼 행을 반복하고, 이벤트명/번호는 tile 로 채움 (cross merge 불필요)
+    n = len(df)
+    df = df.iloc[np.repeat(np.arange(n), len(events))].reset_index(drop=True)
+    df["event_name"] = np.tile(np.asarray(events, dtype=object), n)
+    df["event_id"] = np.tile(np.arange(1, len(events) + 1), n)
     df["event_time"] = pd.NaT
     df["event_exp_time"] = pd.NaT
     df["event_params"] = None
@@ -59,25 +79,29 @@ def preprocess_customer(df: pd.DataFrame) -> pd.DataFrame:
     
     exclude_status = {"취소", "변경", "부도", "보류"}
     df.loc[df["구분"] == "부재", "구분"] = "수술상담"
+    # 상태 종류는 몇 개뿐이라 카테고리 코드로 바꾼 뒤 정수 비교로 제외 대상 마스크 생성
+    status = pd.Categorical(df["상태"])
+    excluded_codes = [code for code, name in enumerate(status.categories) if name in exclude_status]
+    df_active = df[~ np.isin(status.codes, excluded_codes)]
+
+    # "first" 집계는 groupby 기본 경로로 한 번에 처리
     df_summary = (
-        df[~ df["상태"].isin(exclude_status)]
+        df_active
         .groupby("차트번호", as_index=False)
-        .agg({
-            "고객명": "first",
-            "reservation_id": "first",
-            "구분": lambda s: ">".join(pd.unique(s.dropna().astype(str))),
-            "상태": "first",
-            "예약일시": "first",
-            "등록일시": "first",
-            "생년월일": "first",
-            "핸드폰": "first",
-            "원장": "first",
-            "상담자": "first",
-            "메모": "first"
-            }))
+        [["고객명", "reservation_id", "상태", "예약일시", "등록일시", "생년월일", "핸드폰", "원장", "상담자", "메모"]]
+        .first())
+
+    # 구분은 (차트번호, 구분) 중복을 먼저 제거한 뒤 그룹별 join 만 따로 계산
+    gubun = (
+        df_active.loc[df_active["구분"].notna(), ["차트번호", "구분"]]
+        .astype({"구분": str})
+        .drop_duplicates()
+        .groupby("차트번호")["구분"]
+        .agg(">".join))
+    df_summary.insert(3, "구분", df_summary["차트번호"].map(gubun).fillna(""))
     
     df_summary["메모"] = ""
-    df_summary["예약일시"] = df_summary["예약일시"].astype(str) + ".000+09:00"
+    df_summary["예약일시"] = df_summary["예약일시"].dt.strftime("%Y-%m-%d %H:%M:%S.000+09:00")
 
     return df_summary
     
\ No newline at end of file